@@ -1,4 +1,21 @@
 """Utils module"""
+import math
+from itertools import product
+
+# NOTE: all casings of the units are keys, so that units can be looked up
+# without lowering them first
+_BYTES_IN_UNIT = {
+    "".join(casing): divisor
+    for unit, divisor in (("kb", 1 << 10), ("mb", 1 << 20), ("gb", 1 << 30))
+    for casing in product(*((char, char.upper()) for char in unit))
+}
+# NOTE: units used for readable sizes, indexed by the power of 1024
+_READABLE_UNITS = (
+    ("bytes", 1),
+    ("kB", 1 << 10),
+    ("MB", 1 << 20),
+    ("GB", 1 << 30),
+)
 
 
 def convert_bytes(size_bytes: int, to: str) -> float:
@@ -16,18 +33,12 @@ def convert_bytes(size_bytes: int, to: str) -> float:
         `size_bytes` converted to the given unit
     """
     assert to is not None, "Expected unit cannot be `None`"
+    if (divisor := _BYTES_IN_UNIT.get(to)) is not None:
+        return size_bytes / divisor
     to = to.lower()
-    match to:
-        case "bytes":
-            return size_bytes
-        case "kb":
-            return size_bytes / 1024
-        case "mb":
-            return size_bytes / 1024**2
-        case "gb":
-            return size_bytes / 1024**3
-        case _:
-            raise ValueError(f"unsupported units: {to}")
+    if to == "bytes":
+        return size_bytes
+    raise ValueError(f"unsupported units: {to}")
 
 
 def make_bytes_readable_dict(
@@ -58,16 +69,13 @@ def make_bytes_readable_dict(
     if units != "bytes":
         converted_size = convert_bytes(size_bytes=size_bytes, to=units)
         return {"value": converted_size, "units": units}
-    val = size_bytes
-    if val > 1024:
-        units = "kB"
-        val /= 1024
-    if val > 1024:
-        units = "MB"
-        val /= 1024
-    if val > 1024:
-        units = "GB"
-        val /= 1024
+    # NOTE: the unit is the largest one smaller than the size, i.e.
+    # the number of powers of 1024 that `size_bytes` exceeds
+    idx = (math.ceil(size_bytes) - 1).bit_length() - 1
+    units, divisor = _READABLE_UNITS[
+        min(max(idx // 10, 0), len(_READABLE_UNITS) - 1)
+    ]
+    val = size_bytes / divisor
     if val > 0.0 and (round(val, 2) == 0.00):
         val = 0.01
     return {"value": round(val, 2), "units": units}
@@ -1,40 +1,109 @@
 """The module contains authentication backend"""
-from uuid import UUID
+import re
+import time
+from hashlib import blake2b
 
+from fastapi.responses import ORJSONResponse
 from starlette.authentication import (
     AuthCredentials,
     AuthenticationBackend,
+    AuthenticationError,
     UnauthenticatedUser,
 )
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import HTTPConnection
 from dbmanager.dbmanager import DBManager
 
 import exceptions as exc
 from auth.models import DDSUser
 from auth import scopes
 
+# NOTE: user ID needs to be a UUID in its hex form, with or without hyphens
+_USER_ID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}",
+    re.IGNORECASE,
+)
+
+
+class DDSAuthenticationError(AuthenticationError):
+    """Authentication error wrapping the DDS exception that caused it"""
+
+    def __init__(self, err: exc.BaseDDSException) -> None:
+        super().__init__(err.msg)
+        self.code = err.code
+
+
+def on_auth_error(
+    conn: HTTPConnection, err: AuthenticationError
+) -> ORJSONResponse:
+    """Build the response for the failed authentication, in the same
+    form as the one of `fastapi.HTTPException`"""
+    return ORJSONResponse(
+        {"detail": str(err)}, status_code=getattr(err, "code", 400)
+    )
+
 
 class DDSAuthenticationBackend(AuthenticationBackend):
-    """Class managing authentication and authorization"""
+    """Class managing authentication and authorization
+
+    Successful authentications are cached for `cache_ttl` seconds to avoid
+    querying the database for each request of the same user. Tokens are
+    kept in the cache as their digests only. Setting `cache_ttl` to zero
+    disables the cache.
+    """
+
+    def __init__(self, cache_ttl: float = 60.0, cache_size: int = 4096):
+        self._cache_ttl = cache_ttl
+        self._cache_size = cache_size
+        self._cache: dict[bytes, tuple[float, tuple]] = {}
 
     async def authenticate(self, conn):
         """Authenticate user based on `User-Token` header"""
-        if "User-Token" in conn.headers:
-            return self._manage_user_token_auth(conn.headers["User-Token"])
-        return AuthCredentials([scopes.ANONYMOUS]), UnauthenticatedUser()
+        if (user_token := conn.headers.get("User-Token")) is None:
+            return AuthCredentials([scopes.ANONYMOUS]), UnauthenticatedUser()
+        token_digest = blake2b(user_token.encode(), digest_size=16).digest()
+        if (auth_result := self._get_cached_auth(token_digest)) is not None:
+            return auth_result
+        auth_result = await run_in_threadpool(
+            self._manage_user_token_auth, user_token
+        )
+        self._cache_auth(token_digest, auth_result)
+        return auth_result
+
+    def _get_cached_auth(self, token_digest: bytes):
+        if (cached := self._cache.get(token_digest)) is None:
+            return None
+        expires_at, auth_result = cached
+        if expires_at <= time.monotonic():
+            return None
+        return auth_result
+
+    def _cache_auth(self, token_digest: bytes, auth_result: tuple) -> None:
+        if self._cache_ttl <= 0:
+            return
+        if (
+            token_digest not in self._cache
+            and len(self._cache) >= self._cache_size
+        ):
+            del self._cache[next(iter(self._cache))]
+        self._cache[token_digest] = (
+            time.monotonic() + self._cache_ttl,
+            auth_result,
+        )
 
     def _manage_user_token_auth(self, user_token: str):
+        # NOTE: exceptions raised by the authentication backend are not
+        # handled by FastAPI, so they need to be `AuthenticationError`
         try:
             user_id, api_key = self.get_authorization_scheme_param(user_token)
         except exc.BaseDDSException as err:
-            raise err.wrap_around_http_exception()
+            raise DDSAuthenticationError(err) from err
         user_dto = DBManager().get_user_details(user_id)
+        if user_dto is None or user_dto.api_key != api_key:
+            raise DDSAuthenticationError(exc.AuthenticationFailed(user_id))
         eligible_scopes = [scopes.AUTHENTICATED] + self._get_scopes_for_user(
             user_dto=user_dto
         )
-        if user_dto.api_key != api_key:
-            raise exc.AuthenticationFailed(
-                user_dto
-            ).wrap_around_http_exception()
         return AuthCredentials(eligible_scopes), DDSUser(username=user_id)
 
     def _get_scopes_for_user(self, user_dto) -> list[str]:
@@ -54,13 +123,9 @@ class DDSAuthenticationBackend(AuthenticationBackend):
         """Get `user_id` and `api_key` if authorization scheme is correct."""
         if user_token is None or user_token.strip() == "":
             raise exc.EmptyUserTokenError
-        if ":" not in user_token:
+        user_id, separator, api_key = user_token.partition(":")
+        if not separator or ":" in api_key:
             raise exc.ImproperUserTokenError
-        user_id, api_key, *rest = user_token.split(":")
-        if len(rest) > 0:
+        if _USER_ID_PATTERN.fullmatch(user_id) is None:
             raise exc.ImproperUserTokenError
-        try:
-            _ = UUID(user_id, version=4)
-        except ValueError as err:
-            raise exc.ImproperUserTokenError from err
         return (user_id, api_key)
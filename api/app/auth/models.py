@@ -7,32 +7,29 @@ class DDSUser(SimpleUser):
 
     def __init__(self, username: str) -> None:
         super().__init__(username=username)
-
-    @property
-    def id(self):
-        return self.username
+        # NOTE: user ID is the username, kept as a plain attribute
+        # as it is read for each authenticated request
+        self.id = username
 
     def __eq__(self, other) -> bool:
-        if not isinstance(other, DDSUser):
+        if type(other) is not DDSUser:
             return False
-        if self.username == other.username:
-            return True
-        return False
+        return self.username == other.username
 
     def __ne__(self, other):
-        return self != other
+        return not self.__eq__(other)
 
     def __repr__(self):
         return f"<DDSUser(username={self.username}>"
 
     def __delattr__(self, name):
         if getattr(self, name, None) is not None:
-            raise AttributeError("The attribute '{name}' cannot be deleted!")
+            raise AttributeError(f"The attribute '{name}' cannot be deleted!")
         super().__delattr__(name)
 
     def __setattr__(self, name, value):
         if getattr(self, name, None) is not None:
             raise AttributeError(
-                "The attribute '{name}' cannot modified when not None!"
+                f"The attribute '{name}' cannot modified when not None!"
             )
         super().__setattr__(name, value)
@@ -1 +1,3 @@
 from .on_startup import all_onstartup_callbacks
+from .on_shutdown import all_onshutdown_callbacks
+from .lifespan import lifespan
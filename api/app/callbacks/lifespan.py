@@ -0,0 +1,26 @@
+"""Module with the lifespan handler of the API server"""
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from .on_startup import all_onstartup_callbacks
+from .on_shutdown import all_onshutdown_callbacks
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run all startup callbacks concurrently in worker threads, so that
+    blocking warm-up does not hold the event loop, before the server starts
+    accepting requests. Shutdown callbacks are run the same way once
+    the server stops"""
+    await asyncio.gather(
+        *(asyncio.to_thread(callback) for callback in all_onstartup_callbacks)
+    )
+    yield
+    await asyncio.gather(
+        *(
+            asyncio.to_thread(callback)
+            for callback in all_onshutdown_callbacks
+        )
+    )
@@ -0,0 +1,15 @@
+"""Module with functions call during API server shutdown"""
+from utils.api_logging import get_dds_logger
+
+from endpoint_handlers import dataset_handler
+
+log = get_dds_logger(__name__)
+
+
+def _flush_broker_publisher() -> None:
+    log.info("publishing pending broker messages...")
+    dataset_handler.broker_publisher.close()
+    log.info("broker publisher stopped")
+
+
+all_onshutdown_callbacks = [_flush_broker_publisher]
@@ -3,12 +3,17 @@ from utils.api_logging import get_dds_logger
 
 from datastore.datastore import Datastore
 
+from validation import clear_product_lookup_cache
+from endpoint_handlers import dataset_handler
+
 log = get_dds_logger(__name__)
 
 
 def _load_cache() -> None:
     log.info("loading cache started...")
     Datastore()._load_cache()
+    clear_product_lookup_cache()
+    dataset_handler.clear_dataset_caches()
     log.info("cache loaded succesfully!")
 
 
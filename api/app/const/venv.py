@@ -5,3 +5,4 @@ ALLOWED_CORS_ORIGINS_REGEX = "ALLOWED_CORS_ORIGINS_REGEX"
 LOGGING_FORMAT = "LOGGING_FORMAT"
 LOGGING_LEVEL = "LOGGING_LEVEL"
 WEB_COMPONENT_HOST = "WEB_COMPONENT_HOST"
+AUTH_CACHE_TTL_SEC = "AUTH_CACHE_TTL_SEC"
@@ -1,8 +1,10 @@
 """Modules realizing logic for dataset-related endpoints"""
 import os
-import pika
+from functools import lru_cache
 from typing import Optional
 
+import orjson
+from fastapi.encoders import jsonable_encoder
 from dbmanager.dbmanager import DBManager
 from geoquery.geoquery import GeoQuery
 from geoquery.task import TaskList
@@ -14,15 +16,18 @@ from utils.api_logging import get_dds_logger
 from auth.manager import (
     is_role_eligible_for_product,
 )
+from auth import scopes
 import exceptions as exc
 from api_utils import make_bytes_readable_dict
 from validation import assert_product_exists
+from publisher import BrokerPublisher
 
 
 log = get_dds_logger(__name__)
 data_store = Datastore()
-
-MESSAGE_SEPARATOR = os.environ["MESSAGE_SEPARATOR"]
+broker_publisher = BrokerPublisher(
+    host=os.getenv("BROKER_SERVICE_HOST", "broker")
+)
 
 
 @log_execution_time(log)
@@ -50,6 +55,14 @@ def get_datasets(user_roles_names: list[str]) -> list[dict]:
     MissingKeyInCatalogEntryError
         If the dataset catalog entry does not contain the required key
     """
+    return _get_eligible_datasets(frozenset(user_roles_names or ()))
+
+
+# NOTE: eligible datasets are computed once for each set of roles and
+# cleared with `clear_dataset_caches` when the catalog is reloaded.
+# The returned list is shared and must not be modified
+@lru_cache(maxsize=128)
+def _get_eligible_datasets(user_roles_names: frozenset[str]) -> list[dict]:
     log.debug(
         "getting all eligible products for datasets...",
     )
@@ -87,11 +100,28 @@ def get_datasets(user_roles_names: list[str]) -> list[dict]:
                     user_roles_names,
                 )
             else:
-                dataset_info["products"] = eligible_prods
-                datasets.append(dataset_info)
+                datasets.append({**dataset_info, "products": eligible_prods})
     return datasets
 
 
+@lru_cache(maxsize=1)
+def get_public_datasets_json() -> bytes:
+    """Get the JSON-encoded response of the endpoint `GET /datasets` for
+    anonymous users.
+
+    The public catalog is the same for all anonymous requests, so it is
+    encoded once and reused until `clear_dataset_caches` is called.
+
+    Returns
+    -------
+    datasets : bytes
+        JSON-encoded list of datasets eligible for anonymous users
+    """
+    return orjson.dumps(
+        jsonable_encoder(get_datasets(user_roles_names=[scopes.ANONYMOUS]))
+    )
+
+
 @log_execution_time(log)
 @assert_product_exists
 def get_product_details(
@@ -147,7 +177,7 @@ def get_product_details(
 
 @log_execution_time(log)
 @assert_product_exists
-def get_metadata(dataset_id: str, product_id: str):
+def get_metadata(dataset_id: str, product_id: str) -> bytes:
     """Realize the logic for the endpoint:
 
     `GET /datasets/{dataset_id}/{product_id}/metadata`
@@ -160,11 +190,35 @@ def get_metadata(dataset_id: str, product_id: str):
         ID of the dataset
     product_id : str
         ID of the product
+
+    Returns
+    -------
+    metadata : bytes
+        JSON-encoded metadata of the product
     """
     log.debug(
-        "getting metadata for '{dataset_id}.{product_id}'",
+        "getting metadata for '%s.%s'",
+        dataset_id,
+        product_id,
+    )
+    return _get_product_metadata_json(dataset_id, product_id)
+
+
+# NOTE: the encoded metadata are memoized for each product, and cleared
+# with `clear_dataset_caches` when the catalog is reloaded
+@lru_cache(maxsize=None)
+def _get_product_metadata_json(dataset_id: str, product_id: str) -> bytes:
+    return orjson.dumps(
+        jsonable_encoder(data_store.product_metadata(dataset_id, product_id))
     )
-    return data_store.product_metadata(dataset_id, product_id)
+
+
+def clear_dataset_caches() -> None:
+    """Clear cached responses derived from the catalog, so they are
+    computed again after the catalog is reloaded"""
+    _get_eligible_datasets.cache_clear()
+    get_public_datasets_json.cache_clear()
+    _get_product_metadata_json.cache_clear()
 
 
 @log_execution_time(log)
@@ -265,13 +319,6 @@ def query(
         raise exc.EmptyDatasetError(
             dataset_id=dataset_id, product_id=product_id
         )
-    broker_conn = pika.BlockingConnection(
-        pika.ConnectionParameters(
-            host=os.getenv("BROKER_SERVICE_HOST", "broker")
-        )
-    )
-    broker_channel = broker_conn.channel()
-
     request_id = DBManager().create_request(
         user_id=user_id,
         dataset=dataset_id,
@@ -279,20 +326,16 @@ def query(
         query=query.original_query_json(),
     )
 
-    # TODO: find a separator; for the moment use "\"
-    message = MESSAGE_SEPARATOR.join(
-        [str(request_id), "query", dataset_id, product_id, query.json()]
-    )
-
-    broker_channel.basic_publish(
-        exchange="",
-        routing_key="query_queue",
-        body=message,
-        properties=pika.BasicProperties(
-            delivery_mode=2,  # make message persistent
-        ),
+    message = orjson.dumps(
+        {
+            "request_id": request_id,
+            "type": "query",
+            "dataset_id": dataset_id,
+            "product_id": product_id,
+            "content": query.dict(),
+        }
     )
-    broker_conn.close()
+    broker_publisher.publish(message)
     return request_id
 
 
@@ -328,12 +371,6 @@ def run_workflow(
 
     """
     log.debug("geoquery: %s", workflow)
-    broker_conn = pika.BlockingConnection(
-        pika.ConnectionParameters(
-            host=os.getenv("BROKER_SERVICE_HOST", "broker")
-        )
-    )
-    broker_channel = broker_conn.channel()
     request_id = DBManager().create_request(
         user_id=user_id,
         dataset=workflow.dataset_id,
@@ -341,18 +378,14 @@ def run_workflow(
         query=workflow.json(),
     )
 
-    # TODO: find a separator; for the moment use "\"
-    message = MESSAGE_SEPARATOR.join(
-        [str(request_id), "workflow", workflow.json()]
-    )
-
-    broker_channel.basic_publish(
-        exchange="",
-        routing_key="query_queue",
-        body=message,
-        properties=pika.BasicProperties(
-            delivery_mode=2,  # make message persistent
-        ),
+    message = orjson.dumps(
+        {
+            "request_id": request_id,
+            "type": "workflow",
+            "dataset_id": workflow.dataset_id,
+            "product_id": workflow.product_id,
+            "content": workflow.dict(),
+        }
     )
-    broker_conn.close()
+    broker_publisher.publish(message)
     return request_id
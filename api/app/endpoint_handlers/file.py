@@ -54,13 +54,18 @@ def download_request_result(request_id: int):
     download_details = DBManager().get_download_details_for_request(
         request_id=request_id
     )
-    if not os.path.exists(download_details.location_path):
+    try:
+        # NOTE: `stat_result` is passed to `FileResponse` so that the file
+        # is not stat'ed again before streaming it
+        stat_result = os.stat(download_details.location_path)
+    except FileNotFoundError:
         log.error(
             "file '%s' does not exists!",
             download_details.location_path,
         )
-        raise FileNotFoundError
+        raise
     return FileResponse(
         path=download_details.location_path,
-        filename=download_details.location_path.split(os.sep)[-1],
+        filename=os.path.basename(download_details.location_path),
+        stat_result=stat_result,
     )
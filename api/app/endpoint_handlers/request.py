@@ -1,5 +1,7 @@
 """Modules with functions realizing logic for requests-related endpoints"""
-from dbmanager.dbmanager import DBManager
+from threading import Lock
+
+from dbmanager.dbmanager import DBManager, RequestStatus
 
 from utils.api_logging import get_dds_logger
 from utils.metrics import log_execution_time
@@ -7,6 +9,15 @@ import exceptions as exc
 
 log = get_dds_logger(__name__)
 
+# NOTE: statuses of finished requests never change, so they are kept
+# in memory to serve status polling without querying the database
+_FINISHED_STATUSES = frozenset(
+    {RequestStatus.DONE, RequestStatus.FAILED, RequestStatus.TIMEOUT}
+)
+_FINISHED_REQUESTS_CACHE_SIZE = 4096
+_finished_requests_status: dict[int, dict] = {}
+_finished_requests_lock = Lock()
+
 
 @log_execution_time(log)
 def get_requests(user_id: str):
@@ -51,6 +62,8 @@ def get_request_status(user_id: str, request_id: int):
         Tuple of status and fail reason.
     """
     # NOTE: maybe verification should be added if user checks only him\her requests
+    if (cached := _finished_requests_status.get(request_id)) is not None:
+        return cached
     try:
         status, reason = DBManager().get_request_status_and_reason(request_id)
     except IndexError as err:
@@ -59,7 +72,15 @@ def get_request_status(user_id: str, request_id: int):
             request_id,
         )
         raise exc.RequestNotFound(request_id=request_id) from err
-    return {"status": status.name, "fail_reason": reason}
+    result = {"status": status.name, "fail_reason": reason}
+    if status in _FINISHED_STATUSES:
+        with _finished_requests_lock:
+            if len(_finished_requests_status) >= _FINISHED_REQUESTS_CACHE_SIZE:
+                del _finished_requests_status[
+                    next(iter(_finished_requests_status))
+                ]
+            _finished_requests_status[request_id] = result
+    return result
 
 
 @log_execution_time(log)
@@ -5,8 +5,12 @@ from typing import Optional
 
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from starlette.applications import Starlette
 from starlette.middleware.authentication import AuthenticationMiddleware
 from starlette.authentication import requires
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Route
 
 from aioprometheus import (
     Counter,
@@ -26,8 +30,9 @@ from endpoint_handlers import (
     file_handler,
     request_handler,
 )
-from auth.backend import DDSAuthenticationBackend
-from callbacks import all_onstartup_callbacks
+from auth.backend import DDSAuthenticationBackend, on_auth_error
+from middleware import SubAppDispatcherMiddleware
+from callbacks import lifespan
 from encoders import extend_json_encoders
 from const import venv, tags
 from auth import scopes
@@ -50,12 +55,17 @@ app = FastAPI(
         "url": "https://www.apache.org/licenses/LICENSE-2.0.html",
     },
     root_path=os.environ.get(venv.ENDPOINT_PREFIX, "/api"),
-    on_startup=all_onstartup_callbacks,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # ======== Authentication backend ========= #
 app.add_middleware(
-    AuthenticationMiddleware, backend=DDSAuthenticationBackend()
+    AuthenticationMiddleware,
+    backend=DDSAuthenticationBackend(
+        cache_ttl=float(os.environ.get(venv.AUTH_CACHE_TTL_SEC, 60))
+    ),
+    on_error=on_auth_error,
 )
 
 # ======== CORS ========= #
@@ -78,7 +88,14 @@ app.add_middleware(
 
 # ======== Prometheus metrics ========= #
 app.add_middleware(MetricsMiddleware)
-app.add_route("/metrics", metrics)
+# NOTE: `/metrics` is served by a separate sub-app dispatched by
+# the outermost middleware, so Prometheus scrapes skip the CORS,
+# authentication and metrics middlewares
+app.add_middleware(
+    SubAppDispatcherMiddleware,
+    path="/metrics",
+    sub_app=Starlette(routes=[Route("/metrics", metrics)]),
+)
 
 app.state.api_request_duration_seconds = Summary(
     "api_request_duration_seconds", "Requests duration"
@@ -89,13 +106,13 @@ app.state.api_http_requests_total = Counter(
 
 
 # ======== Endpoints definitions ========= #
-@app.get("/", tags=[tags.BASIC])
+@app.get("/", tags=[tags.BASIC], response_model=None)
 async def geolake_info():
     """Return current version of the geolake API"""
-    return f"geolake API {__version__}"
+    return ORJSONResponse(f"geolake API {__version__}")
 
 
-@app.get("/datasets", tags=[tags.DATASET])
+@app.get("/datasets", tags=[tags.DATASET], response_model=None)
 @timer(
     app.state.api_request_duration_seconds, labels={"route": "GET /datasets"}
 )
@@ -103,8 +120,16 @@ async def get_datasets(request: Request):
     """List all products eligible for a user defined by user_token"""
     app.state.api_http_requests_total.inc({"route": "GET /datasets"})
     try:
-        return dataset_handler.get_datasets(
-            user_roles_names=request.auth.scopes
+        if not request.user.is_authenticated:
+            return Response(
+                await run_in_threadpool(
+                    dataset_handler.get_public_datasets_json
+                ),
+                media_type="application/json",
+            )
+        return await run_in_threadpool(
+            dataset_handler.get_datasets,
+            user_roles_names=request.auth.scopes,
         )
     except exc.BaseDDSException as err:
         raise err.wrap_around_http_exception() from err
@@ -124,7 +149,8 @@ async def get_first_product_details(
         {"route": "GET /datasets/{dataset_id}"}
     )
     try:
-        return dataset_handler.get_product_details(
+        return await run_in_threadpool(
+            dataset_handler.get_product_details,
             user_roles_names=request.auth.scopes,
             dataset_id=dataset_id,
         )
@@ -147,7 +173,8 @@ async def get_product_details(
         {"route": "GET /datasets/{dataset_id}/{product_id}"}
     )
     try:
-        return dataset_handler.get_product_details(
+        return await run_in_threadpool(
+            dataset_handler.get_product_details,
             user_roles_names=request.auth.scopes,
             dataset_id=dataset_id,
             product_id=product_id,
@@ -156,7 +183,11 @@ async def get_product_details(
         raise err.wrap_around_http_exception() from err
 
 
-@app.get("/datasets/{dataset_id}/{product_id}/metadata", tags=[tags.DATASET])
+@app.get(
+    "/datasets/{dataset_id}/{product_id}/metadata",
+    tags=[tags.DATASET],
+    response_model=None,
+)
 @timer(
     app.state.api_request_duration_seconds,
     labels={"route": "GET /datasets/{dataset_id}/{product_id}/metadata"},
@@ -171,14 +202,23 @@ async def get_metadata(
         {"route": "GET /datasets/{dataset_id}/{product_id}/metadata"}
     )
     try:
-        return dataset_handler.get_metadata(
-            dataset_id=dataset_id, product_id=product_id
+        return Response(
+            await run_in_threadpool(
+                dataset_handler.get_metadata,
+                dataset_id=dataset_id,
+                product_id=product_id,
+            ),
+            media_type="application/json",
         )
     except exc.BaseDDSException as err:
         raise err.wrap_around_http_exception() from err
 
 
-@app.post("/datasets/{dataset_id}/{product_id}/estimate", tags=[tags.DATASET])
+@app.post(
+    "/datasets/{dataset_id}/{product_id}/estimate",
+    tags=[tags.DATASET],
+    response_model=None,
+)
 @timer(
     app.state.api_request_duration_seconds,
     labels={"route": "POST /datasets/{dataset_id}/{product_id}/estimate"},
@@ -195,17 +235,24 @@ async def estimate(
         {"route": "POST /datasets/{dataset_id}/{product_id}/estimate"}
     )
     try:
-        return dataset_handler.estimate(
-            dataset_id=dataset_id,
-            product_id=product_id,
-            query=query,
-            unit=unit,
+        return ORJSONResponse(
+            await run_in_threadpool(
+                dataset_handler.estimate,
+                dataset_id=dataset_id,
+                product_id=product_id,
+                query=query,
+                unit=unit,
+            )
         )
     except exc.BaseDDSException as err:
         raise err.wrap_around_http_exception() from err
 
 
-@app.post("/datasets/{dataset_id}/{product_id}/execute", tags=[tags.DATASET])
+@app.post(
+    "/datasets/{dataset_id}/{product_id}/execute",
+    tags=[tags.DATASET],
+    response_model=None,
+)
 @timer(
     app.state.api_request_duration_seconds,
     labels={"route": "POST /datasets/{dataset_id}/{product_id}/execute"},
@@ -222,17 +269,20 @@ async def query(
         {"route": "POST /datasets/{dataset_id}/{product_id}/execute"}
     )
     try:
-        return dataset_handler.query(
-            user_id=request.user.id,
-            dataset_id=dataset_id,
-            product_id=product_id,
-            query=query,
+        return ORJSONResponse(
+            await run_in_threadpool(
+                dataset_handler.query,
+                user_id=request.user.id,
+                dataset_id=dataset_id,
+                product_id=product_id,
+                query=query,
+            )
         )
     except exc.BaseDDSException as err:
         raise err.wrap_around_http_exception() from err
 
 
-@app.post("/datasets/workflow", tags=[tags.DATASET])
+@app.post("/datasets/workflow", tags=[tags.DATASET], response_model=None)
 @timer(
     app.state.api_request_duration_seconds,
     labels={"route": "POST /datasets/workflow"},
@@ -245,9 +295,12 @@ async def workflow(
     """Schedule the job of workflow processing"""
     app.state.api_http_requests_total.inc({"route": "POST /datasets/workflow"})
     try:
-        return dataset_handler.run_workflow(
-            user_id=request.user.id,
-            workflow=tasks,
+        return ORJSONResponse(
+            await run_in_threadpool(
+                dataset_handler.run_workflow,
+                user_id=request.user.id,
+                workflow=tasks,
+            )
         )
     except exc.BaseDDSException as err:
         raise err.wrap_around_http_exception() from err
@@ -264,12 +317,16 @@ async def get_requests(
     """Get all requests for the user"""
     app.state.api_http_requests_total.inc({"route": "GET /requests"})
     try:
-        return request_handler.get_requests(request.user.id)
+        return await run_in_threadpool(
+            request_handler.get_requests, request.user.id
+        )
     except exc.BaseDDSException as err:
         raise err.wrap_around_http_exception() from err
 
 
-@app.get("/requests/{request_id}/status", tags=[tags.REQUEST])
+@app.get(
+    "/requests/{request_id}/status", tags=[tags.REQUEST], response_model=None
+)
 @timer(
     app.state.api_request_duration_seconds,
     labels={"route": "GET /requests/{request_id}/status"},
@@ -284,14 +341,20 @@ async def get_request_status(
         {"route": "GET /requests/{request_id}/status"}
     )
     try:
-        return request_handler.get_request_status(
-            user_id=request.user.id, request_id=request_id
+        return ORJSONResponse(
+            await run_in_threadpool(
+                request_handler.get_request_status,
+                user_id=request.user.id,
+                request_id=request_id,
+            )
         )
     except exc.BaseDDSException as err:
         raise err.wrap_around_http_exception() from err
 
 
-@app.get("/requests/{request_id}/size", tags=[tags.REQUEST])
+@app.get(
+    "/requests/{request_id}/size", tags=[tags.REQUEST], response_model=None
+)
 @timer(
     app.state.api_request_duration_seconds,
     labels={"route": "GET /requests/{request_id}/size"},
@@ -306,14 +369,19 @@ async def get_request_resulting_size(
         {"route": "GET /requests/{request_id}/size"}
     )
     try:
-        return request_handler.get_request_resulting_size(
-            request_id=request_id
+        return ORJSONResponse(
+            await run_in_threadpool(
+                request_handler.get_request_resulting_size,
+                request_id=request_id,
+            )
         )
     except exc.BaseDDSException as err:
         raise err.wrap_around_http_exception() from err
 
 
-@app.get("/requests/{request_id}/uri", tags=[tags.REQUEST])
+@app.get(
+    "/requests/{request_id}/uri", tags=[tags.REQUEST], response_model=None
+)
 @timer(
     app.state.api_request_duration_seconds,
     labels={"route": "GET /requests/{request_id}/uri"},
@@ -328,7 +396,11 @@ async def get_request_uri(
         {"route": "GET /requests/{request_id}/uri"}
     )
     try:
-        return request_handler.get_request_uri(request_id=request_id)
+        return ORJSONResponse(
+            await run_in_threadpool(
+                request_handler.get_request_uri, request_id=request_id
+            )
+        )
     except exc.BaseDDSException as err:
         raise err.wrap_around_http_exception() from err
 
@@ -348,7 +420,9 @@ async def download_request_result(
         {"route": "GET /download/{request_id}"}
     )
     try:
-        return file_handler.download_request_result(request_id=request_id)
+        return await run_in_threadpool(
+            file_handler.download_request_result, request_id=request_id
+        )
     except exc.BaseDDSException as err:
         raise err.wrap_around_http_exception() from err
     except FileNotFoundError as err:
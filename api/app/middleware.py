@@ -0,0 +1,25 @@
+"""Module with custom ASGI middlewares"""
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class SubAppDispatcherMiddleware:
+    """Pure ASGI middleware dispatching requests for the given path
+    directly to a sub-application.
+
+    Requests matching `path` skip all the middlewares registered on the main
+    application after this one (e.g. authentication, CORS, metrics).
+    """
+
+    def __init__(self, app: ASGIApp, path: str, sub_app: ASGIApp) -> None:
+        self.app = app
+        self.path = path
+        self.sub_app = sub_app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"] in (
+            self.path,
+            scope.get("root_path", "") + self.path,
+        ):
+            await self.sub_app(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -0,0 +1,204 @@
+"""Module with the publisher of messages sent to the broker"""
+import queue
+import threading
+
+import pika
+
+from utils.api_logging import get_dds_logger
+
+log = get_dds_logger(__name__)
+
+
+class BrokerPublisher:
+    """Publisher sending messages to the broker in the background.
+
+    Messages are put on an in-memory queue and published in batches by
+    a single worker thread, so request handlers do not wait for
+    the broker. The worker thread owns the broker connection. It opens
+    the connection lazily, services its heartbeats while idle and
+    reopens it if the broker drops it. Publisher confirms are enabled,
+    so a message counts as published only once the broker accepted it.
+    While the broker is unavailable, publishing is retried with
+    exponential backoff, so messages are not lost.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        host: str,
+        queue_name: str = "query_queue",
+        batch_size: int = 64,
+        retry_delay: float = 0.5,
+        max_retry_delay: float = 30.0,
+        heartbeat: int = 60,
+    ) -> None:
+        self.host = host
+        self.queue_name = queue_name
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.heartbeat = heartbeat
+        self._stopping = threading.Event()
+        self._connection = None
+        self._channel = None
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+
+    def _get_channel(self):
+        if self._channel is None or self._channel.is_closed:
+            self._close()
+            self._connection = pika.BlockingConnection(
+                pika.ConnectionParameters(
+                    host=self.host, heartbeat=self.heartbeat
+                )
+            )
+            self._channel = self._connection.channel()
+            # NOTE: with confirms, `basic_publish` raises if the broker
+            # nacks the message or (being `mandatory`) cannot route it
+            self._channel.confirm_delivery()
+        return self._channel
+
+    def _close(self) -> None:
+        if self._connection is not None and self._connection.is_open:
+            try:
+                self._connection.close()
+            except pika.exceptions.AMQPError:
+                log.debug("failed to close broker connection", exc_info=True)
+        self._connection = self._channel = None
+
+    def _process_data_events(self) -> None:
+        # NOTE: the connection is used only by the worker thread, so
+        # heartbeats must be serviced by it while there is nothing to publish
+        if self._connection is None or not self._connection.is_open:
+            return
+        try:
+            self._connection.process_data_events(time_limit=0)
+        except (pika.exceptions.AMQPError, OSError):
+            log.info("broker connection lost while idle", exc_info=True)
+            self._close()
+
+    def _publish(self, message: bytes) -> None:
+        self._get_channel().basic_publish(
+            exchange="",
+            routing_key=self.queue_name,
+            body=message,
+            properties=pika.BasicProperties(
+                content_type="application/json",
+                delivery_mode=2,  # make message persistent
+            ),
+            mandatory=True,
+        )
+
+    def _publish_batch(self, messages: list[bytes]) -> None:
+        idx, delay = 0, self.retry_delay
+        while idx < len(messages):
+            try:
+                self._publish(messages[idx])
+            except (pika.exceptions.AMQPError, OSError):
+                self._close()
+                if self._stopping.is_set():
+                    log.error(
+                        "broker unavailable during shutdown. %d message(s)"
+                        " were not published",
+                        len(messages) - idx,
+                        exc_info=True,
+                    )
+                    return
+                log.info(
+                    "broker unavailable. retrying in %.1f sec...",
+                    delay,
+                    exc_info=True,
+                )
+                # NOTE: wakes up earlier if the publisher is being closed
+                self._stopping.wait(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+            else:
+                idx, delay = idx + 1, self.retry_delay
+
+    def _next_message(self):
+        timeout = self.heartbeat / 2 if self.heartbeat else None
+        while True:
+            try:
+                return self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._process_data_events()
+
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            messages = [self._next_message()]
+            while len(messages) < self.batch_size:
+                try:
+                    messages.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self._STOP in messages:
+                stopped = True
+                messages = [msg for msg in messages if msg is not self._STOP]
+            if not messages:
+                continue
+            try:
+                self._publish_batch(messages)
+            except Exception:
+                # NOTE: the worker thread must survive unexpected errors,
+                # otherwise all the next messages would pile up in the queue
+                log.exception(
+                    "unexpected error while publishing. %d message(s) were"
+                    " not published",
+                    len(messages),
+                )
+                self._close()
+            else:
+                log.debug("published batch of %d message(s)", len(messages))
+        self._close()
+
+    def _start_thread(self) -> None:
+        # NOTE: must be called with `_thread_lock` held
+        if self._thread is not None:
+            log.error("broker publisher thread died. restarting...")
+        self._thread = threading.Thread(
+            target=self._run, name="broker-publisher", daemon=True
+        )
+        self._thread.start()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._start_thread()
+
+    def publish(self, message: bytes) -> None:
+        """Schedule the message to be published to the queue.
+
+        The method returns immediately. The background worker thread
+        sends the message.
+
+        Parameters
+        ----------
+        message : bytes
+            JSON-encoded body of the message
+        """
+        self._ensure_started()
+        self._queue.put(message)
+
+    def close(self) -> None:
+        """Publish all scheduled messages and stop the worker thread.
+
+        Messages are published with a single attempt once closing
+        started, so an unavailable broker does not block the shutdown.
+        """
+        with self._thread_lock:
+            if self._thread is None:
+                return
+            self._stopping.set()
+            if not self._thread.is_alive():
+                # NOTE: messages left by a dead worker thread are published
+                # by a new one before stopping
+                self._start_thread()
+            self._queue.put(self._STOP)
+            self._thread.join()
+            self._thread = None
+            self._stopping.clear()
@@ -1,14 +1,30 @@
 from datastore.datastore import Datastore
 from utils.api_logging import get_dds_logger
-from decorators_factory import assert_parameters_are_defined, bind_arguments
-from functools import wraps
-from inspect import signature
+from decorators_factory import assert_parameters_are_defined
+from functools import lru_cache, wraps
+from inspect import Parameter, signature
 import exceptions as exc
 
 
 log = get_dds_logger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _product_lookup(
+    dataset_id: str, product_id: str | None
+) -> tuple[bool, bool]:
+    """Check if the dataset and the product are defined in the catalog.
+    Results are cached, so the cache needs to be cleared once the catalog
+    is reloaded."""
+    return Datastore().contains(dataset_id, product_id)
+
+
+def clear_product_lookup_cache() -> None:
+    """Clear cached results of the catalog lookups done by
+    `assert_product_exists`"""
+    _product_lookup.cache_clear()
+
+
 def assert_product_exists(func):
     """Decorator for convenient checking if product is defined in the catalog
     """
@@ -16,18 +32,32 @@ def assert_product_exists(func):
     assert_parameters_are_defined(
         sig, required_parameters=[("dataset_id", str), ("product_id", str)]
     )
+    # NOTE: positions and the default are resolved once, so that arguments
+    # are taken directly from `args` or `kwargs` without binding
+    # them to the signature for each call
+    params_names = list(sig.parameters)
+    dataset_idx = params_names.index("dataset_id")
+    product_idx = params_names.index("product_id")
+    product_default = sig.parameters["product_id"].default
+    if product_default is Parameter.empty:
+        product_default = None
 
     @wraps(func)
     def assert_inner(*args, **kwargs):
-        args_dict = bind_arguments(sig, *args, **kwargs)
-        dataset_id = args_dict["dataset_id"]
-        product_id = args_dict["product_id"]
-        if dataset_id not in Datastore().dataset_list():
+        if len(args) > dataset_idx:
+            dataset_id = args[dataset_idx]
+        else:
+            dataset_id = kwargs["dataset_id"]
+        if len(args) > product_idx:
+            product_id = args[product_idx]
+        else:
+            product_id = kwargs.get("product_id", product_default)
+        dataset_exists, product_exists = _product_lookup(
+            dataset_id, product_id
+        )
+        if not dataset_exists:
             raise exc.MissingDatasetError(dataset_id=dataset_id)
-        elif (
-            product_id is not None
-            and product_id not in Datastore().product_list(dataset_id)
-        ):
+        elif not product_exists:
             raise exc.MissingProductError(
                 dataset_id=dataset_id, product_id=product_id
             )
@@ -4,6 +4,9 @@ from __future__ import annotations
 import os
 import logging
 import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock
 
 import intake
 from dask.delayed import Delayed
@@ -19,11 +22,31 @@ from .const import BaseRole
 from .exception import UnauthorizedError
 
 DEFAULT_MAX_REQUEST_SIZE_GB = 10
+DEFAULT_CACHE_LOAD_WORKERS = 32
+_MISSING = object()
+# NOTE: datasets present in the catalog but not served
+_EXCLUDED_DATASETS = frozenset({"medsea-rea-e3r1"})
 
 
 class Datastore(metaclass=Singleton):
     """Singleton component for managing catalog data"""
 
+    __slots__ = (
+        "catalog_path",
+        "_catalog",
+        "_parametrized_catalog",
+        "cache_dir",
+        "cache",
+        "cache_max_size",
+        "_cache_lock",
+        "_dataset_list",
+        "_product_lists",
+        "_catalog_index",
+        "_datasets_info",
+        "_products_metadata",
+        "_products_data",
+    )
+
     _LOG = logging.getLogger("geokube.Datastore")
 
     def __init__(self) -> None:
@@ -43,10 +66,51 @@ class Datastore(metaclass=Singleton):
                 "'CACHE_PATH' environment variable was not set. catalog will"
                 " not be opened!"
             )
-        self.catalog = intake.open_catalog(os.environ["CATALOG_PATH"])
+        self.catalog_path = os.environ["CATALOG_PATH"]
+        self._catalog = None
+        self._parametrized_catalog = None
         self.cache_dir = os.environ["CACHE_PATH"]
         self._LOG.info("cache dir set to %s", self.cache_dir)
-        self.cache = None
+        # NOTE: the cache is unbounded unless `DS_CACHE_MAX` is set. Then
+        # the least recently used products are evicted above that size
+        self.cache: OrderedDict[tuple[str, str], DataCube | Dataset] = (
+            OrderedDict()
+        )
+        self.cache_max_size: int | None = (
+            int(os.environ["DS_CACHE_MAX"])
+            if "DS_CACHE_MAX" in os.environ
+            else None
+        )
+        self._cache_lock = Lock()
+        self._dataset_list: list[str] | None = None
+        self._product_lists: dict[str, list[str]] = {}
+        self._catalog_index: dict[str, frozenset[str]] | None = None
+        self._datasets_info: dict[str, dict] = {}
+        self._products_metadata: dict[tuple[str, str], dict] = {}
+        self._products_data: dict[tuple[str, str], dict] = {}
+        # NOTE: `Datastore` is a singleton, so the handler is added once
+        self._LOG.setLevel(os.environ.get("LOGGING_LEVEL", "INFO"))
+        self._LOG.addHandler(logging.StreamHandler())
+
+    @property
+    def catalog(self):
+        """Intake catalog, opened on the first access"""
+        # NOTE: opening the catalog parses its YAML files, so it is deferred
+        # until the catalog is actually needed
+        if self._catalog is None:
+            self._LOG.info("opening catalog %s", self.catalog_path)
+            self._catalog = intake.open_catalog(self.catalog_path)
+        return self._catalog
+
+    @property
+    def _cat(self):
+        # NOTE: the catalog parametrized with the cache directory is created
+        # once and reused, as the cache directory does not change
+        if self._parametrized_catalog is None:
+            self._parametrized_catalog = self.catalog(
+                CACHE_DIR=self.cache_dir
+            )
+        return self._parametrized_catalog
 
     @log_execution_time(_LOG)
     def get_cached_product_or_read(
@@ -55,6 +119,7 @@ class Datastore(metaclass=Singleton):
         """Get product from the cache instead of loading files indicated in
         the catalog if `metadata_caching` set to `True`.
         If might return `geokube.DataCube` or `geokube.Dataset`.
+        Products missing in the cache are read and then cached.
 
         Parameters
         -------
@@ -67,80 +132,143 @@ class Datastore(metaclass=Singleton):
         -------
         kube : DataCube or Dataset
         """
-        if self.cache is None:
-            self._load_cache()
-        if (
-            dataset_id not in self.cache
-            or product_id not in self.cache[dataset_id]
-        ):
-            self._LOG.info(
-                "dataset `%s` or product `%s` not found in cache! Reading"
-                " product!",
-                dataset_id,
-                product_id,
-            )
-            return self.catalog(CACHE_DIR=self.cache_dir)[dataset_id][
-                product_id
-            ].read_chunked()
-        return self.cache[dataset_id][product_id]
+        key = (dataset_id, product_id)
+        if (kube := self.cache.get(key)) is not None:
+            if self.cache_max_size is not None:
+                with self._cache_lock:
+                    if key in self.cache:
+                        self.cache.move_to_end(key)
+            return kube
+        self._LOG.info(
+            "dataset `%s` or product `%s` not found in cache! Reading"
+            " product!",
+            dataset_id,
+            product_id,
+        )
+        catalog_entry = self._cat[dataset_id][product_id]
+        kube = catalog_entry.read_chunked()
+        # NOTE: products with `metadata_caching` set to `False` are never
+        # kept in memory, the same as when loading the cache
+        if catalog_entry.metadata_caching:
+            self._store_in_cache(key, kube)
+        return kube
+
+    def _store_in_cache(
+        self, key: tuple[str, str], kube: DataCube | Dataset
+    ) -> None:
+        with self._cache_lock:
+            self.cache[key] = kube
+            self.cache.move_to_end(key)
+            if self.cache_max_size is None:
+                return
+            while len(self.cache) > self.cache_max_size:
+                evicted, _ = self.cache.popitem(last=False)
+                self._LOG.info("product `%s.%s` evicted from cache", *evicted)
 
     @log_execution_time(_LOG)
     def _load_cache(self):
-        if self.cache is None:
-            self.cache = {}
-        for i, dataset_id in enumerate(self.dataset_list()):
+        # NOTE: preloads all the products with `metadata_caching` enabled,
+        # so it might require a lot of memory for large catalogs.
+        # Otherwise products are cached on first use
+        self._dataset_list = None
+        self._product_lists = {}
+        self._catalog_index = None
+        self._datasets_info = {}
+        self._products_metadata = {}
+        self._products_data = {}
+        datasets = self.dataset_list()
+        datasets_num = len(datasets)
+        jobs, not_cached = [], []
+        for i, dataset_id in enumerate(datasets):
             self._LOG.info(
                 "loading cache for `%s` (%d/%d)",
                 dataset_id,
                 i + 1,
-                len(self.dataset_list()),
+                datasets_num,
             )
-            self.cache[dataset_id] = {}
+            dataset_entry = self._cat[dataset_id]
             for product_id in self.product_list(dataset_id):
-                catalog_entry = self.catalog(CACHE_DIR=self.cache_dir)[
-                    dataset_id
-                ][product_id]
+                catalog_entry = dataset_entry[product_id]
                 if not catalog_entry.metadata_caching:
-                    self._LOG.info(
-                        "`metadata_caching` for product %s.%s set to `False`",
-                        dataset_id,
-                        product_id,
-                    )
+                    not_cached.append(f"{dataset_id}.{product_id}")
                     continue
+                jobs.append((dataset_id, product_id, catalog_entry))
+        if not_cached:
+            self._LOG.info(
+                "`metadata_caching` set to `False` for %d product(s): %s",
+                len(not_cached),
+                not_cached,
+            )
+        if self.cache_max_size is not None and len(jobs) > self.cache_max_size:
+            self._LOG.info(
+                "only %d out of %d products will be preloaded to cache",
+                self.cache_max_size,
+                len(jobs),
+            )
+            jobs = jobs[: self.cache_max_size]
+        cache = OrderedDict()
+        # NOTE: reading products is I/O-bound, so they are read concurrently.
+        # The new cache is filled only by the calling thread and replaces
+        # the current one at once
+        workers = (
+            min(
+                int(
+                    os.environ.get(
+                        "CACHE_LOAD_WORKERS", DEFAULT_CACHE_LOAD_WORKERS
+                    )
+                ),
+                len(jobs),
+            )
+            or 1
+        )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(catalog_entry.read_chunked): (
+                    dataset_id,
+                    product_id,
+                )
+                for dataset_id, product_id, catalog_entry in jobs
+            }
+            for future in as_completed(futures):
+                dataset_id, product_id = futures[future]
                 try:
-                    self.cache[dataset_id][
-                        product_id
-                    ] = catalog_entry.read_chunked()
-                except ValueError:
+                    cache[dataset_id, product_id] = future.result()
+                except (ValueError, NotImplementedError):
                     self._LOG.error(
                         "failed to load cache for `%s.%s`",
                         dataset_id,
                         product_id,
                         exc_info=True,
                     )
+        with self._cache_lock:
+            self.cache = cache
 
     @log_execution_time(_LOG)
     def dataset_list(self) -> list:
         """Get list of datasets available in the catalog stored in `catalog`
-        attribute
+        attribute. The list is computed once and reset when the cache
+        is reloaded.
 
         Returns
         -------
         datasets : list
-            List of datasets present in the catalog
+            List of datasets present in the catalog. It must not be modified
         """
-        datasets = set(self.catalog(CACHE_DIR=self.cache_dir))
-        datasets -= {
-            "medsea-rea-e3r1",
-        }
-        # NOTE: medsae cmip uses cftime.DatetimeNoLeap as time
-        # need to think how to handle it
-        return sorted(list(datasets))
+        if self._dataset_list is None:
+            # NOTE: medsae cmip uses cftime.DatetimeNoLeap as time
+            # need to think how to handle it
+            self._dataset_list = sorted(
+                dataset_id
+                for dataset_id in self._cat
+                if dataset_id not in _EXCLUDED_DATASETS
+            )
+        return self._dataset_list
 
     @log_execution_time(_LOG)
     def product_list(self, dataset_id: str):
         """Get list of products available in the catalog for dataset
-        indicated by `dataset_id`
+        indicated by `dataset_id`. The list is computed once and reset
+        when the cache is reloaded.
 
         Parameters
         ----------
@@ -150,14 +278,61 @@ class Datastore(metaclass=Singleton):
         Returns
         -------
         products : list
-            List of products for the dataset
+            List of products for the dataset. It must not be modified
+        """
+        if (products := self._product_lists.get(dataset_id)) is None:
+            products = self._product_lists[dataset_id] = list(
+                self._cat[dataset_id]
+            )
+        return products
+
+    def catalog_index(self) -> dict[str, frozenset[str]]:
+        """Get mapping of datasets available in the catalog to the sets
+        of their products, for fast membership checks. The mapping is
+        computed once and reset when the cache is reloaded.
+
+        Returns
+        -------
+        index : dict
+            Dict of products sets for each dataset present in the catalog.
+            It must not be modified
+        """
+        if self._catalog_index is None:
+            self._catalog_index = {
+                dataset_id: frozenset(self.product_list(dataset_id))
+                for dataset_id in self.dataset_list()
+            }
+        return self._catalog_index
+
+    def contains(
+        self, dataset_id: str, product_id: str | None = None
+    ) -> tuple[bool, bool]:
+        """Check if the dataset and the product are defined in
+        the catalog, with a single lookup.
+
+        Parameters
+        ----------
+        dataset_id : str
+            ID of the dataset
+        product_id : optional, str
+            ID of the product. If `None`, only the dataset is checked
+
+        Returns
+        -------
+        exist : tuple of bool
+            Flags indicating if the dataset and the product exist.
+            The product is reported as existing if `product_id` is `None`
+            and the dataset exists
         """
-        return list(self.catalog(CACHE_DIR=self.cache_dir)[dataset_id])
+        if (products := self.catalog_index().get(dataset_id)) is None:
+            return False, False
+        return True, product_id is None or product_id in products
 
     @log_execution_time(_LOG)
     def dataset_info(self, dataset_id: str):
         """Get information about the dataset and names of all available
-        products (with their metadata)
+        products (with their metadata). The information is memoized and
+        reset when the cache is reloaded.
 
         Parameters
         ----------
@@ -167,25 +342,31 @@ class Datastore(metaclass=Singleton):
         Returns
         -------
         info : dict
-            Dict of short information about the dataset
+            Dict of short information about the dataset. It must not be
+            modified
         """
+        if (info := self._datasets_info.get(dataset_id)) is not None:
+            return info
         info = {}
-        entry = self.catalog(CACHE_DIR=self.cache_dir)[dataset_id]
+        entry = self._cat[dataset_id]
+        # NOTE: metadata dicts are copied, so that entries of the catalog
+        # are not modified
         if entry.metadata:
-            info["metadata"] = entry.metadata
-            info["metadata"]["id"] = dataset_id
+            info["metadata"] = {**entry.metadata, "id": dataset_id}
         info["products"] = {}
         for product_id in entry:
             prod_entry = entry[product_id]
-            info["products"][product_id] = prod_entry.metadata
-            info["products"][product_id][
-                "description"
-            ] = prod_entry.description
+            info["products"][product_id] = {
+                **prod_entry.metadata,
+                "description": prod_entry.description,
+            }
+        self._datasets_info[dataset_id] = info
         return info
 
     @log_execution_time(_LOG)
     def product_metadata(self, dataset_id: str, product_id: str):
-        """Get product metadata directly from the catalog.
+        """Get product metadata directly from the catalog. Metadata are
+        memoized and reset when the cache is reloaded.
 
         Parameters
         ----------
@@ -197,11 +378,14 @@ class Datastore(metaclass=Singleton):
         Returns
         -------
         metadata : dict
-            DatasetMetadata of the product
+            DatasetMetadata of the product. It must not be modified
         """
-        return self.catalog(CACHE_DIR=self.cache_dir)[dataset_id][
-            product_id
-        ].metadata
+        key = (dataset_id, product_id)
+        if (metadata := self._products_metadata.get(key)) is None:
+            metadata = self._products_metadata[key] = self._cat[dataset_id][
+                product_id
+            ].metadata
+        return metadata
 
     @log_execution_time(_LOG)
     def first_eligible_product_details(
@@ -222,7 +406,8 @@ class Datastore(metaclass=Singleton):
             should be selected
         use_cache : bool, optional, default=False
             Data will be loaded from cache if set to `True` or directly
-            from the catalog otherwise
+            from the catalog otherwise. Loading from the catalog opens
+            the product and builds its dask graph, which is expensive
 
         Returns
         -------
@@ -236,23 +421,20 @@ class Datastore(metaclass=Singleton):
         """
         info = {}
         product_ids = self.product_list(dataset_id)
+        dataset_entry = self._cat[dataset_id]
+        roles = self._role_set(role)
         for prod_id in product_ids:
-            if not self.is_product_valid_for_role(
-                dataset_id, prod_id, role=role
-            ):
+            entry = dataset_entry[prod_id]
+            if not self._is_entry_valid_for_role(entry, roles=roles):
                 continue
-            entry = self.catalog(CACHE_DIR=self.cache_dir)[dataset_id][prod_id]
             if entry.metadata:
                 info["metadata"] = entry.metadata
             info["description"] = entry.description
             info["id"] = prod_id
             info["dataset"] = self.dataset_info(dataset_id=dataset_id)
-            if use_cache:
-                info["data"] = self.get_cached_product_or_read(
-                    dataset_id, prod_id
-                ).to_dict()
-            else:
-                info["data"] = entry.read_chunked().to_dict()
+            info["data"] = self._product_data(
+                dataset_id, prod_id, entry, use_cache
+            )
             return info
         raise UnauthorizedError()
 
@@ -276,7 +458,8 @@ class Datastore(metaclass=Singleton):
             Role code for which the the product is requested.
         use_cache : bool, optional, default=False
             Data will be loaded from cache if set to `True` or directly
-            from the catalog otherwise
+            from the catalog otherwise. Loading from the catalog opens
+            the product and builds its dask graph, which is expensive
 
         Returns
         -------
@@ -289,37 +472,47 @@ class Datastore(metaclass=Singleton):
             if the requested product is not eligible for a role
         """
         info = {}
-        if not self.is_product_valid_for_role(
-            dataset_id, product_id, role=role
+        entry = self._cat[dataset_id][product_id]
+        if not self._is_entry_valid_for_role(
+            entry, roles=self._role_set(role)
         ):
             raise UnauthorizedError()
-        entry = self.catalog(CACHE_DIR=self.cache_dir)[dataset_id][product_id]
         if entry.metadata:
             info["metadata"] = entry.metadata
         info["description"] = entry.description
         info["id"] = product_id
         info["dataset"] = self.dataset_info(dataset_id=dataset_id)
-        if use_cache:
-            info["data"] = self.get_cached_product_or_read(
+        info["data"] = self._product_data(
+            dataset_id, product_id, entry, use_cache
+        )
+        return info
+
+    def _product_data(
+        self, dataset_id: str, product_id: str, entry, use_cache: bool
+    ) -> dict:
+        # NOTE: `to_dict()` of a product read from the catalog requires
+        # opening its files. The API always uses the memoized cached one.
+        if not use_cache:
+            return entry.read_chunked().to_dict()
+        # NOTE: dict representations of cached products are memoized,
+        # so they must not be modified
+        key = (dataset_id, product_id)
+        if (data := self._products_data.get(key)) is None:
+            data = self._products_data[key] = self.get_cached_product_or_read(
                 dataset_id, product_id
             ).to_dict()
-        else:
-            info["data"] = entry.read_chunked().to_dict()
-        return info
+        return data
 
     def product_info(
         self, dataset_id: str, product_id: str, use_cache: bool = False
     ):
         info = {}
-        entry = self.catalog(CACHE_DIR=self.cache_dir)[dataset_id][product_id]
+        entry = self._cat[dataset_id][product_id]
         if entry.metadata:
             info["metadata"] = entry.metadata
-        if use_cache:
-            info["data"] = self.get_cached_product_or_read(
-                dataset_id, product_id
-            ).to_dict()
-        else:
-            info["data"] = entry.read_chunked().to_dict()
+        info["data"] = self._product_data(
+            dataset_id, product_id, entry, use_cache
+        )
         return info
 
     @log_execution_time(_LOG)
@@ -354,9 +547,7 @@ class Datastore(metaclass=Singleton):
         self._LOG.debug("processing GeoQuery: %s", geoquery)
         # NOTE: we always use catalog directly and single product cache
         self._LOG.debug("loading product...")
-        kube = self.catalog(CACHE_DIR=self.cache_dir)[dataset_id][
-            product_id
-        ].read_chunked()
+        kube = self._cat[dataset_id][product_id].read_chunked()
         self._LOG.debug("original kube len: %s", len(kube))
         return Datastore._process_query(kube, geoquery, compute)
 
@@ -400,67 +591,82 @@ class Datastore(metaclass=Singleton):
         product_id: str,
         role: str | list[str] | None = None,
     ):
-        entry = self.catalog(CACHE_DIR=self.cache_dir)[dataset_id][product_id]
-        product_role = BaseRole.PUBLIC
-        if entry.metadata:
-            product_role = entry.metadata.get("role", BaseRole.PUBLIC)
+        entry = self._cat[dataset_id][product_id]
+        return Datastore._is_entry_valid_for_role(
+            entry, roles=Datastore._role_set(role)
+        )
+
+    @staticmethod
+    def _role_set(role: str | list[str] | None) -> frozenset[str]:
+        # NOTE: a single role is not iterated, so that role names are
+        # compared as a whole rather than as substrings
+        if not role:
+            return frozenset()
+        if isinstance(role, str):
+            return frozenset((role,))
+        return frozenset(role)
+
+    @staticmethod
+    def _is_entry_valid_for_role(entry, roles: frozenset[str]) -> bool:
+        metadata = entry.metadata
+        if not metadata:
+            return True
+        product_role = metadata.get("role", BaseRole.PUBLIC)
         if product_role == BaseRole.PUBLIC:
             return True
-        if not role:
+        if not roles:
             # NOTE: it means, we consider the public profile
             return False
-        if BaseRole.ADMIN in role:
-            return True
-        if product_role in role:
-            return True
-        return False
+        return BaseRole.ADMIN in roles or product_role in roles
 
     @staticmethod
     def _process_query(kube, query: GeoQuery, compute: None | bool = False):
+        log = Datastore._LOG
+        convert = Datastore._maybe_convert_dict_slice_to_slice
         if isinstance(kube, Dataset):
-            Datastore._LOG.debug("filtering with: %s", query.filters)
+            log.debug("filtering with: %s", query.filters)
             kube = kube.filter(**query.filters)
-            Datastore._LOG.debug("resulting kube len: %s", len(kube))
+            log.debug("resulting kube len: %s", len(kube))
         if isinstance(kube, Delayed) and compute:
             kube = kube.compute()
-        if query.variable:
-            Datastore._LOG.debug("selecting fields...")
-            kube = kube[query.variable]
-        if query.area:
-            Datastore._LOG.debug("subsetting by geobbox...")
-            kube = kube.geobbox(**query.area)
-        if query.location:
-            Datastore._LOG.debug("subsetting by locations...")
-            kube = kube.locations(**query.location)
-        if query.time:
-            Datastore._LOG.debug("subsetting by time...")
-            kube = kube.sel(
-                **{
-                    "time": Datastore._maybe_convert_dict_slice_to_slice(
-                        query.time
-                    )
-                }
-            )
-        if query.vertical:
-            Datastore._LOG.debug("subsetting by vertical...")
-            if isinstance(
-                vertical := Datastore._maybe_convert_dict_slice_to_slice(
-                    query.vertical
-                ),
-                slice,
-            ):
-                method = None
-            else:
-                method = "nearest"
+        # NOTE: query fields are read once, most of them are usually `None`
+        variable, area, location, time, vertical = (
+            query.variable,
+            query.area,
+            query.location,
+            query.time,
+            query.vertical,
+        )
+        if variable:
+            log.debug("selecting fields...")
+            kube = kube[variable]
+        if area:
+            log.debug("subsetting by geobbox...")
+            kube = kube.geobbox(**area)
+        if location:
+            log.debug("subsetting by locations...")
+            kube = kube.locations(**location)
+        if time:
+            log.debug("subsetting by time...")
+            kube = kube.sel(time=convert(time))
+        if vertical:
+            log.debug("subsetting by vertical...")
+            vertical = convert(vertical)
+            method = None if type(vertical) is slice else "nearest"
             kube = kube.sel(vertical=vertical, method=method)
         return kube.compute() if compute else kube
 
     @staticmethod
     def _maybe_convert_dict_slice_to_slice(dict_vals):
-        if "start" in dict_vals or "stop" in dict_vals:
-            return slice(
-                dict_vals.get("start"),
-                dict_vals.get("stop"),
-                dict_vals.get("step"),
-            )
-        return dict_vals
+        # NOTE: `vertical` might also be a single value or a list of values
+        if not isinstance(dict_vals, dict):
+            return dict_vals
+        start = dict_vals.get("start", _MISSING)
+        stop = dict_vals.get("stop", _MISSING)
+        if start is _MISSING and stop is _MISSING:
+            return dict_vals
+        return slice(
+            None if start is _MISSING else start,
+            None if stop is _MISSING else stop,
+            dict_vals.get("step"),
+        )
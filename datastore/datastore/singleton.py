@@ -4,8 +4,6 @@
 The module contains metaclass called <b>Singleton</b>
 for thread-safe singleton-pattern implementation.
 """
-import os
-import logging
 from threading import Lock
 from typing import Any, Type
 
@@ -17,13 +15,11 @@ class Singleton(type):
     _lock: Lock = Lock()
 
     def __call__(cls, *args, **kwargs):
+        # NOTE: the lock is taken only until the instance is created
+        if (instance := cls._instances.get(cls)) is not None:
+            return instance
         with cls._lock:
             if cls not in cls._instances:
                 instance = super().__call__(*args, **kwargs)
-                if hasattr(instance, "_LOG"):
-                    instance._LOG.setLevel(
-                        os.environ.get("LOGGING_LEVEL", "INFO")
-                    )
-                    instance._LOG.addHandler(logging.StreamHandler())
                 cls._instances[cls] = instance
         return cls._instances[cls]
@@ -1,6 +1,6 @@
 """Utils module"""
 from functools import wraps
-import datetime
+import time
 import logging
 
 
@@ -10,16 +10,18 @@ def log_execution_time(logger: logging.Logger):
     def inner(func):
         @wraps(func)
         def wrapper(*args, **kwds):
-            exec_start_time = datetime.datetime.now()
+            if not logger.isEnabledFor(logging.INFO):
+                return func(*args, **kwds)
+            exec_start_time = time.perf_counter_ns()
             try:
                 return func(*args, **kwds)
             finally:
-                exec_time = datetime.datetime.now() - exec_start_time
                 logger.info(
-                    "execution of '%s' function from '%s' package took %s",
+                    "execution of '%s' function from '%s' package took"
+                    " %.4f sec",
                     func.__name__,
                     func.__module__,
-                    exec_time,
+                    (time.perf_counter_ns() - exec_start_time) / 1e9,
                 )
 
         return wrapper
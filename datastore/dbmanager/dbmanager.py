@@ -21,9 +21,14 @@ from sqlalchemy import (
     Table,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import declarative_base, sessionmaker, relationship
+from sqlalchemy.orm import (
+    declarative_base,
+    joinedload,
+    sessionmaker,
+    relationship,
+)
 
-from .singleton import Singleton
+from datastore.singleton import Singleton
 
 
 def is_true(item) -> bool:
@@ -170,8 +175,14 @@ class DBManager(metaclass=Singleton):
 
         url = f"postgresql://{user}:{password}@{host}:{port}/{database}"
         self._LOG.info("db connection: `%s`", url)
+        # NOTE: the engine is created once per process (`DBManager` is
+        # a singleton) and its connection pool is shared by all the callers
         self.__engine = create_engine(
-            url, echo=is_true(os.environ.get("DB_LOGGING", False))
+            url,
+            echo=is_true(os.environ.get("DB_LOGGING", False)),
+            pool_size=int(os.environ.get("DB_POOL_SIZE", 10)),
+            max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", 20)),
+            pool_pre_ping=True,
         )
         self.__session_maker = sessionmaker(bind=self.__engine)
 
@@ -187,7 +198,7 @@ class DBManager(metaclass=Singleton):
     def add_user(
         self,
         contact_name: str,
-        user_id: UUID | None = None,
+        user_id: uuid.UUID | str | None = None,
         api_key: str | None = None,
         roles_names: list[str] | None = None,
     ):
@@ -208,28 +219,30 @@ class DBManager(metaclass=Singleton):
             session.commit()
             return user
 
-    def get_user_details(self, user_id: int):
+    def get_user_details(self, user_id: uuid.UUID | str):
         with self.__session_maker() as session:
-            return session.query(User).get(user_id)
+            return session.get(User, user_id)
 
-    def get_user_roles_names(self, user_id: int | None = None) -> list[str]:
+    def get_user_roles_names(
+        self, user_id: uuid.UUID | str | None = None
+    ) -> list[str]:
         if user_id is None:
             return ["public"]
         with self.__session_maker() as session:
             return list(
                 map(
                     lambda role: role.role_name,
-                    session.query(User).get(user_id).roles,
+                    session.get(User, user_id).roles,
                 )
             )
 
     def get_request_details(self, request_id: int):
         with self.__session_maker() as session:
-            return session.query(Request).get(request_id)
+            return session.get(Request, request_id)
 
     def get_download_details_for_request(self, request_id: int):
         with self.__session_maker() as session:
-            request_details = session.query(Request).get(request_id)
+            request_details = session.get(Request, request_id)
             if request_details is None:
                 raise ValueError(
                     f"Request with id: {request_id} doesn't exist"
@@ -238,7 +251,7 @@ class DBManager(metaclass=Singleton):
 
     def create_request(
         self,
-        user_id: int = 1,
+        user_id: uuid.UUID | str,
         dataset: str | None = None,
         product: str | None = None,
         query: str | None = None,
@@ -274,7 +287,7 @@ class DBManager(metaclass=Singleton):
         fail_reason: str = None,
     ) -> int:
         with self.__session_maker() as session:
-            request = session.query(Request).get(request_id)
+            request = session.get(Request, request_id)
             request.status = status
             request.worker_id = worker_id
             request.last_update = datetime.utcnow()
@@ -295,21 +308,36 @@ class DBManager(metaclass=Singleton):
 
     def get_request_status_and_reason(
         self, request_id
-    ) -> None | RequestStatus:
+    ) -> tuple[RequestStatus, str | None]:
         with self.__session_maker() as session:
-            if request := session.query(Request).get(request_id):
+            # NOTE: only the required columns are selected to avoid loading
+            # the whole request together with its download details
+            if request := (
+                session.query(Request.status, Request.fail_reason)
+                .filter(Request.request_id == request_id)
+                .one_or_none()
+            ):
                 return RequestStatus(request.status), request.fail_reason
             raise IndexError(
                 f"Request with id: `{request_id}` does not exist!"
             )
 
-    def get_requests_for_user_id(self, user_id) -> list[Request]:
+    def get_requests_for_user_id(
+        self, user_id: uuid.UUID | str
+    ) -> list[Request]:
         with self.__session_maker() as session:
-            return session.query(User).get(user_id).requests
+            # NOTE: requests are fetched together with their downloads
+            # in a single query, without loading the user and its roles
+            return (
+                session.query(Request)
+                .options(joinedload(Request.download))
+                .filter(Request.user_id == user_id)
+                .all()
+            )
 
     def get_download_details_for_request_id(self, request_id) -> Download:
         with self.__session_maker() as session:
-            request_details = session.query(Request).get(request_id)
+            request_details = session.get(Request, request_id)
             if request_details is None:
                 raise IndexError(
                     f"Request with id: `{request_id}` does not exist!"
@@ -1,12 +1,55 @@
 import json
 from typing import Optional, List, Dict, Union, Mapping, Any, TypeVar
 
+import orjson
 from pydantic import BaseModel, root_validator, validator
 
 TGeoQuery = TypeVar("TGeoQuery")
 
 
-class GeoQuery(BaseModel, extra="allow"):
+def orjson_dumps(value: Any, *, default, **dumps_kwargs) -> str:
+    """Serialize `value` with orjson, to be used as `json_dumps` of
+    the pydantic models config. `indent=2` and `sort_keys` are mapped to
+    orjson options, other arguments of `.json()` that orjson does not
+    support fall back to the standard `json` module"""
+    if not dumps_kwargs:
+        return orjson.dumps(value, default=default).decode()
+    if dumps_kwargs.keys() <= {"indent", "sort_keys"} and dumps_kwargs.get(
+        "indent"
+    ) in (None, 2):
+        option = 0
+        if dumps_kwargs.get("indent") == 2:
+            option |= orjson.OPT_INDENT_2
+        if dumps_kwargs.get("sort_keys"):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(value, default=default, option=option).decode()
+    return json.dumps(value, default=default, **dumps_kwargs)
+
+
+def _geoquery_from_json(cls, load: str | bytes | bytearray):
+    return cls.parse(orjson.loads(load))
+
+
+def _geoquery_from_dict(cls, load: dict):
+    return cls(**load)
+
+
+# NOTE: parsers are looked up by the exact type of the load,
+# subclasses of `dict` fall back to the `isinstance` check
+_GEOQUERY_PARSERS = {
+    str: _geoquery_from_json,
+    bytes: _geoquery_from_json,
+    bytearray: _geoquery_from_json,
+    dict: _geoquery_from_dict,
+}
+
+
+class GeoQuery(
+    BaseModel,
+    extra="allow",
+    json_loads=orjson.loads,
+    json_dumps=orjson_dumps,
+):
     variable: Optional[Union[str, List[str]]]
     # TODO: Check how `time` is to be represented
     time: Optional[Union[Dict[str, str], Dict[str, List[str]]]]
@@ -32,10 +75,16 @@ class GeoQuery(BaseModel, extra="allow"):
     def build_filters(cls, values: Dict[str, Any]) -> Dict[str, Any]:
         if "filters" in values:
             return values
-        filters = {k: v for k, v in values.items() if k not in cls.__fields__}
-        values = {k: v for k, v in values.items() if k in cls.__fields__}
-        values["filters"] = filters
-        return values
+        # NOTE: values are split in a single pass and the input dict
+        # is not modified
+        fields, filters = {}, {}
+        for key, value in values.items():
+            if key in _GEOQUERY_FIELDS:
+                fields[key] = value
+            else:
+                filters[key] = value
+        fields["filters"] = filters
+        return fields
 
     @validator("vertical")
     def match_vertical_dict(cls, value):
@@ -47,12 +96,15 @@ class GeoQuery(BaseModel, extra="allow"):
     def original_query_json(self):
         """Return the JSON representation of the original query submitted
         to the geokube-dds"""
-        res = super().dict()
-        res = dict(**res.pop("filters", {}), **res)
+        fields = super().dict()
+        filters = fields.pop("filters", None) or {}
         # NOTE: skip empty values to make query representation
         # shorter and more elegant
-        res = dict(filter(lambda item: item[1] is not None, res.items()))
-        return json.dumps(res)
+        res = {k: v for k, v in filters.items() if v is not None}
+        for key, value in fields.items():
+            if value is not None:
+                res[key] = value
+        return orjson.dumps(res).decode()
 
     @classmethod
     def parse(
@@ -60,13 +112,16 @@ class GeoQuery(BaseModel, extra="allow"):
     ) -> TGeoQuery:
         if isinstance(load, cls):
             return load
-        if isinstance(load, (str, bytes, bytearray)):
-            load = json.loads(load)
-        if isinstance(load, dict):
-            load = GeoQuery(**load)
-        else:
-            raise TypeError(
-                f"type of the `load` argument ({type(load).__name__}) is not"
-                " supported!"
-            )
-        return load
+        if (parser := _GEOQUERY_PARSERS.get(type(load))) is None:
+            if not isinstance(load, dict):
+                raise TypeError(
+                    f"type of the `load` argument ({type(load).__name__}) is"
+                    " not supported!"
+                )
+            parser = _geoquery_from_dict
+        return parser(cls, load)
+
+
+# NOTE: names of the declared fields, used to separate the extra fields
+# passed to `GeoQuery` as filters
+_GEOQUERY_FIELDS = frozenset(GeoQuery.__fields__)
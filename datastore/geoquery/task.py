@@ -1,12 +1,36 @@
-import json
-from collections import Counter
 from typing import Any, Optional, TypeVar
 
-from pydantic import BaseModel, Field, validator
+import orjson
+from pydantic import BaseModel, Field, PrivateAttr, validator
+
+from .geoquery import orjson_dumps
 
 TWorkflow = TypeVar("TWorkflow")
 
 
+def _tasklist_from_json(cls, workflow: str | bytes | bytearray):
+    return cls.parse(orjson.loads(workflow))
+
+
+def _tasklist_from_list(cls, workflow: list[dict]):
+    return cls(tasks=workflow)
+
+
+def _tasklist_from_dict(cls, workflow: dict):
+    return cls(**workflow)
+
+
+# NOTE: parsers are looked up by the exact type of the workflow,
+# subclasses of `list` and `dict` fall back to the `isinstance` checks
+_TASKLIST_PARSERS = {
+    str: _tasklist_from_json,
+    bytes: _tasklist_from_json,
+    bytearray: _tasklist_from_json,
+    list: _tasklist_from_list,
+    dict: _tasklist_from_dict,
+}
+
+
 class Task(BaseModel):
     id: str | int
     op: str
@@ -22,12 +46,23 @@ class Task(BaseModel):
 
 class TaskList(BaseModel):
     tasks: list[Task]
+    # NOTE: the first `subset` task together with the list of tasks
+    # it was found in, so it is found again if the tasks are replaced
+    _subset_task_cache: Optional[tuple[list[Task], Optional[Task]]] = (
+        PrivateAttr(default=None)
+    )
+
+    class Config:
+        json_loads = orjson.loads
+        json_dumps = orjson_dumps
 
     @validator("tasks")
     def match_unique_ids(cls, items):
-        for id_value, id_count in Counter([item.id for item in items]).items():
-            if id_count != 1:
-                raise ValueError(f"duplicated key found: `{id_value}`")
+        ids = set()
+        for item in items:
+            if item.id in ids:
+                raise ValueError(f"duplicated key found: `{item.id}`")
+            ids.add(item.id)
         return items
 
     @classmethod
@@ -37,26 +72,33 @@ class TaskList(BaseModel):
     ) -> TWorkflow:
         if isinstance(workflow, cls):
             return workflow
-        if isinstance(workflow, (str | bytes | bytearray)):
-            workflow = json.loads(workflow)
-        if isinstance(workflow, list):
-            return cls(tasks=workflow)
-        elif isinstance(workflow, dict):
-            return cls(**workflow)
-        else:
-            raise TypeError(
-                f"`workflow` argument of type `{type(workflow).__name__}`"
-                " cannot be safetly parsed to the `Workflow`"
+        if (parser := _TASKLIST_PARSERS.get(type(workflow))) is None:
+            if isinstance(workflow, list):
+                parser = _tasklist_from_list
+            elif isinstance(workflow, dict):
+                parser = _tasklist_from_dict
+            else:
+                raise TypeError(
+                    f"`workflow` argument of type `{type(workflow).__name__}`"
+                    " cannot be safetly parsed to the `Workflow`"
+                )
+        return parser(cls, workflow)
+
+    def _subset_task(self) -> Optional[Task]:
+        cache = self._subset_task_cache
+        if cache is None or cache[0] is not self.tasks:
+            subset_task = next(
+                (task for task in self.tasks if task.op == "subset"), None
             )
+            cache = self._subset_task_cache = (self.tasks, subset_task)
+        return cache[1]
 
     @property
     def dataset_id(self):
-        for task in self.tasks:
-            if task.op == "subset":
-                return task.args.get("dataset_id", "<unknown>")
+        if (subset_task := self._subset_task()) is not None:
+            return subset_task.args.get("dataset_id", "<unknown>")
 
     @property
     def product_id(self):
-        for task in self.tasks:
-            if task.op == "subset":
-                return task.args.get("product_id", "<unknown>")
+        if (subset_task := self._subset_task()) is not None:
+            return subset_task.args.get("product_id", "<unknown>")
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from geoquery.geoquery import GeoQuery
@@ -63,3 +65,36 @@ def test_emtpy_filters():
     query = GeoQuery(**query_dict)
     assert isinstance(query.filters, dict)
     assert len(query.filters) == 0
+
+
+@pytest.mark.parametrize(
+    "dumps_kwargs",
+    [
+        {},
+        {"indent": 2},
+        {"sort_keys": True},
+        {"indent": 4},
+        {"separators": (",", ":")},
+    ],
+)
+def test_json_accepts_dumps_kwargs(dumps_kwargs):
+    query = GeoQuery(variable=["wind_speed"], area={"north": 10, "south": 5})
+    assert json.loads(query.json(**dumps_kwargs)) == json.loads(query.json())
+
+
+@pytest.mark.parametrize("indent", [2, 4])
+def test_json_indent(indent):
+    query = GeoQuery(variable=["wind_speed"], area={"north": 10, "south": 5})
+    assert query.json(indent=indent) == json.dumps(
+        json.loads(query.json()), indent=indent
+    )
+
+
+def test_json_sort_keys():
+    query = GeoQuery(variable=["wind_speed"], area={"south": 5, "north": 10})
+    keys = list(json.loads(query.json(sort_keys=True)))
+    assert keys == sorted(keys)
+    assert list(json.loads(query.json(sort_keys=True))["area"]) == [
+        "north",
+        "south",
+    ]
@@ -14,7 +14,11 @@ def log_execution_time(
     def inner(func):
         @wraps(func)
         def wrapper(*args, **kwds):
-            exec_start_time = time.monotonic()
+            # NOTE: the execution is not timed if the message would not
+            # be logged anyway
+            if not logger.isEnabledFor(level):
+                return func(*args, **kwds)
+            exec_start_time = time.perf_counter_ns()
             try:
                 return func(*args, **kwds)
             finally:
@@ -25,7 +29,7 @@ def log_execution_time(
                     " %.4f sec",
                     func.__name__,
                     func.__module__,
-                    time.monotonic() - exec_start_time,
+                    (time.perf_counter_ns() - exec_start_time) / 1e9,
                 )
 
         return wrapper
@@ -1,9 +1,9 @@
 import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Generator, Hashable, Callable, Literal, Any
 from functools import partial
 import logging
 
-import networkx as nx
 from geokube.core.datacube import DataCube
 from geoquery.geoquery import GeoQuery
 from geoquery.task import TaskList
@@ -45,21 +45,39 @@ class _WorkflowTask:
             dependencies = []
         self.dependencies = dependencies
 
-    def compute(self, kube: DataCube | None) -> DataCube:
+    def compute(
+        self, kube: DataCube | dict[Hashable, DataCube] | None
+    ) -> DataCube:
         return self.operator(kube)
 
 
 class Workflow:
-    __slots__ = ("graph", "present_nodes_ids", "is_verified")
+    __slots__ = (
+        "is_verified",
+        "_tasks",
+        "_id_to_idx",
+        "_pred",
+        "_succ",
+        "_topo_order",
+    )
 
-    graph: nx.DiGraph
-    present_nodes_ids: set[Hashable]
     is_verified: bool
+    # NOTE: tasks are kept in flat lists indexed by the order they were
+    # added. Dependencies are resolved to indices when verifying, as tasks
+    # can depend on tasks added later
+    _tasks: list[_WorkflowTask]
+    _id_to_idx: dict[Hashable, int]
+    _pred: list[list[int]]
+    _succ: list[list[int]]
+    _topo_order: list[int] | None
 
     def __init__(self) -> None:
-        self.graph = nx.DiGraph()
-        self.present_nodes_ids = set()
         self.is_verified = False
+        self._tasks = []
+        self._id_to_idx = {}
+        self._pred = []
+        self._succ = []
+        self._topo_order = None
 
     @classmethod
     def from_tasklist(cls, task_list: TaskList) -> "Workflow":
@@ -89,13 +107,12 @@ class Workflow:
     def _add_computational_node(self, task: _WorkflowTask):
         node_id = task.id
         assert (
-            node_id not in self.present_nodes_ids
+            node_id not in self._id_to_idx
         ), "worflow task IDs need to be unique!"
-        self.present_nodes_ids.add(node_id)
-        self.graph.add_node(node_id, **{TASK_ATTRIBUTE: task})
-        for dependend_node in task.dependencies:
-            self.graph.add_edge(dependend_node, node_id)
+        self._id_to_idx[node_id] = len(self._tasks)
+        self._tasks.append(task)
         self.is_verified = False
+        self._topo_order = None
 
     def subset(
         self,
@@ -183,41 +200,159 @@ class Workflow:
 
     def verify(self) -> "Workflow":
         if self.is_verified:
-            return
-        assert nx.is_directed_acyclic_graph(
-            self.graph
+            return self
+        id_to_idx = self._id_to_idx
+        pred: list[list[int]] = []
+        succ: list[list[int]] = [[] for _ in self._tasks]
+        for idx, task in enumerate(self._tasks):
+            parents = []
+            # NOTE: repeated dependencies are counted once
+            for dependency in dict.fromkeys(task.dependencies):
+                if (parent := id_to_idx.get(dependency)) is None:
+                    _LOG.error(
+                        "task with id `%s` is not defined for the workflow",
+                        dependency,
+                    )
+                    raise ValueError(
+                        f"task with id `{dependency}` is not defined for the"
+                        " workflow"
+                    )
+                parents.append(parent)
+                succ[parent].append(idx)
+            pred.append(parents)
+        # NOTE: the topological order is computed once (Kahn's algorithm)
+        # and kept until the next task is added
+        in_degree = [len(parents) for parents in pred]
+        topo_order = [
+            idx for idx, degree in enumerate(in_degree) if not degree
+        ]
+        for idx in topo_order:
+            for child in succ[idx]:
+                in_degree[child] -= 1
+                if not in_degree[child]:
+                    topo_order.append(child)
+        assert len(topo_order) == len(
+            self._tasks
         ), "the workflow contains cycles!"
-        for u, v in self.graph.edges:
-            if TASK_ATTRIBUTE not in self.graph.nodes[u].keys():
-                _LOG.error(
-                    "task with id `%s` is not defined for the workflow", u
-                )
-                raise ValueError(
-                    f"task with id `{u}` is not defined for the workflow"
-                )
-            if TASK_ATTRIBUTE not in self.graph.nodes[v].keys():
-                _LOG.error(
-                    "task with id `%s` is not defined for the workflow", v
-                )
-                raise ValueError(
-                    f"task with id `{v}` is not defined for the workflow"
-                )
+        self._pred, self._succ = pred, succ
+        self._topo_order = topo_order
         self.is_verified = True
+        return self
 
     def traverse(self) -> Generator[_WorkflowTask, None, None]:
-        for node_id in nx.topological_sort(self.graph):
-            _LOG.debug("computing task for the node: %s", node_id)
-            yield self.graph.nodes[node_id][TASK_ATTRIBUTE]
+        self.verify()
+        for idx in self._topo_order:
+            task = self._tasks[idx]
+            _LOG.debug("computing task for the node: %s", task.id)
+            yield task
+
+    def _task_input(
+        self, idx: int, results: list
+    ) -> DataCube | dict[Hashable, DataCube] | None:
+        # NOTE: source tasks get `None`, tasks with a single dependency get
+        # its result and tasks with many dependencies get a dict of results
+        # keyed by the dependency ID
+        parents = self._pred[idx]
+        if not parents:
+            return None
+        if len(parents) == 1:
+            return results[parents[0]]
+        return {self._tasks[parent].id: results[parent] for parent in parents}
+
+    def compute(self, max_workers: int | None = None) -> DataCube:
+        """Compute the workflow. Tasks are run in the calling thread while
+        they form a chain. When several tasks are ready at the same time,
+        they are run concurrently in a thread pool, so independent branches
+        do not wait for each other.
+
+        Parameters
+        ----------
+        max_workers : int, optional, default=None
+            Maximum number of tasks run at the same time. If `None`,
+            the default of `ThreadPoolExecutor` is used
+
+        Returns
+        -------
+        kube : DataCube
+            Result of the last task in the topological order
+
+        Raises
+        ------
+        ValueError
+            if the workflow does not contain any task
+        """
+        self.verify()
+        if not self._tasks:
+            _LOG.error("cannot compute the workflow without tasks")
+            raise ValueError("cannot compute the workflow without tasks")
+        tasks, succ = self._tasks, self._succ
+        in_degree = [len(parents) for parents in self._pred]
+        results = [None] * len(tasks)
+        ready = [idx for idx, degree in enumerate(in_degree) if not degree]
+        pending = {}
+        executor = None
+        try:
+            while ready or pending:
+                if len(ready) == 1 and not pending:
+                    idx = ready.pop()
+                    _LOG.debug(
+                        "computing task for the node: %s", tasks[idx].id
+                    )
+                    results[idx] = tasks[idx].compute(
+                        self._task_input(idx, results)
+                    )
+                    finished = [idx]
+                else:
+                    # NOTE: the pool is started only when branches fan out
+                    if executor is None:
+                        executor = ThreadPoolExecutor(max_workers=max_workers)
+                    for idx in ready:
+                        _LOG.debug(
+                            "computing task for the node: %s", tasks[idx].id
+                        )
+                        future = executor.submit(
+                            tasks[idx].compute, self._task_input(idx, results)
+                        )
+                        pending[future] = idx
+                    ready = []
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    finished = []
+                    for future in done:
+                        idx = pending.pop(future)
+                        results[idx] = future.result()
+                        finished.append(idx)
+                for idx in finished:
+                    for child in succ[idx]:
+                        in_degree[child] -= 1
+                        if not in_degree[child]:
+                            ready.append(child)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return results[self._topo_order[-1]]
+
+    def to_networkx(self):
+        """Export the workflow as `networkx.DiGraph`, e.g. for debugging
+        or visualization. Tasks are stored in the `task` node attribute.
+
+        Returns
+        -------
+        graph : networkx.DiGraph
+            Graph of the workflow tasks
+        """
+        import networkx as nx
 
-    def compute(self) -> DataCube:
         self.verify()
-        result = None
-        for task in self.traverse():
-            result = task.compute(result)
-        return result
+        graph = nx.DiGraph()
+        for task in self._tasks:
+            graph.add_node(task.id, **{TASK_ATTRIBUTE: task})
+        for idx, children in enumerate(self._succ):
+            for child in children:
+                graph.add_edge(self._tasks[idx].id, self._tasks[child].id)
+        return graph
 
     def __len__(self):
-        return len(self.graph.nodes)
+        return len(self._tasks)
 
     def __getitem__(self, idx: Hashable):
-        return self.graph.nodes[idx]
+        return {TASK_ATTRIBUTE: self._tasks[self._id_to_idx[idx]]}
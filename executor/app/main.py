@@ -334,7 +334,8 @@ class Executor(metaclass=LoggableMeta):
                     )
                     break
                 self._LOG.debug(
-                    f"result is not ready yet. sleeping {sleep_time} sec",
+                    "result is not ready yet. sleeping %s sec",
+                    sleep_time,
                     extra={"track_id": message.request_id},
                 )
                 time.sleep(sleep_time)
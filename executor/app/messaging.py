@@ -1,12 +1,11 @@
-import os
 import logging
 from enum import Enum
 
+import orjson
+
 from geoquery.geoquery import GeoQuery
 from geoquery.task import TaskList
 
-MESSAGE_SEPARATOR = os.environ["MESSAGE_SEPARATOR"]
-
 
 class MessageType(Enum):
     QUERY = "query"
@@ -23,20 +22,20 @@ class Message:
     content: GeoQuery | TaskList
 
     def __init__(self, load: bytes) -> None:
-        self.request_id, msg_type, *query = load.decode().split(
-            MESSAGE_SEPARATOR
-        )
+        load = orjson.loads(load)
+        # NOTE: request ID is used to build names of the resulting files
+        self.request_id = str(load["request_id"])
+        msg_type = load["type"]
         match MessageType(msg_type):
             case MessageType.QUERY:
                 self._LOG.debug("processing content of `query` type")
-                assert len(query) == 3, "improper content for query message"
-                self.dataset_id, self.product_id, self.content = query
-                self.content: GeoQuery = GeoQuery.parse(self.content)
+                self.dataset_id = load["dataset_id"]
+                self.product_id = load["product_id"]
+                self.content: GeoQuery = GeoQuery.parse(load["content"])
                 self.type = MessageType.QUERY
             case MessageType.WORKFLOW:
                 self._LOG.debug("processing content of `workflow` type")
-                assert len(query) == 1, "improper content for workflow message"
-                self.content: TaskList = TaskList.parse(query[0])
+                self.content: TaskList = TaskList.parse(load["content"])
                 self.dataset_id = self.content.dataset_id
                 self.product_id = self.content.product_id
                 self.type = MessageType.WORKFLOW